@@ -225,7 +225,8 @@ class SpecificationResponse(BaseModel):
 
     @staticmethod
     def from_specification(specification: Specification) -> "SpecificationResponse":
-        logger.debug(specification.model_dump_json())
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(specification.model_dump_json())
         module_out = []
         modules: list[prisma.models.Module] | None = (
             specification.Modules if specification.Modules else None
@@ -1,5 +1,7 @@
+import functools
 import glob
 import hashlib
+import json
 import logging
 import os
 import pathlib
@@ -116,8 +118,92 @@ class ValidatedResponse(BaseModel):
     usage_statistics: CompletionUsage
     message: str
 
-    class config:
-        arbitrary_types_allowed = True
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+
+@functools.lru_cache(maxsize=None)
+def get_template_env(templates_dir: str) -> Environment:
+    """
+    Jinja environments are cached per template directory, so each template is only
+    read and compiled once per process instead of on every LLM call.
+    """
+    return Environment(loader=FileSystemLoader(templates_dir))
+
+
+@functools.lru_cache(maxsize=None)
+def get_pydantic_format_instructions(pydantic_object: Type[BaseModel]) -> str:
+    """
+    Renders the format instructions for the given pydantic object.
+    The JSON schema is only generated once per pydantic object.
+    """
+    schema = json.dumps(pydantic_object.model_json_schema())
+    template_dir = os.path.join(
+        os.path.dirname(__file__),
+        "../prompts/techniques/",
+    )
+    prompt_template = get_template_env(template_dir).get_template(
+        "pydantic_format_instruction.j2"
+    )
+    return prompt_template.render({"schema": schema})
+
+
+def to_strict_json_schema(node: Any) -> Any:
+    """
+    Converts a pydantic JSON schema into one accepted by OpenAI structured outputs
+    in strict mode: every object lists all its properties as required and forbids
+    additional properties, and the `title` / `default` keywords are dropped.
+
+    Raises:
+        ValueError: If the schema has a free-form (dict typed) object, as strict
+            mode can't describe objects with arbitrary keys.
+    """
+    if isinstance(node, list):
+        return [to_strict_json_schema(item) for item in node]
+    if not isinstance(node, dict):
+        return node
+    if node.get("type") == "object" and "properties" not in node:
+        raise ValueError(
+            "Free-form objects (dict fields) are not supported by strict json_schema"
+        )
+
+    strict: dict[str, Any] = {}
+    for key, value in node.items():
+        if key in ("properties", "$defs"):
+            # Keys here are field / definition names, not schema keywords
+            strict[key] = {
+                name: to_strict_json_schema(sub) for name, sub in value.items()
+            }
+        elif key not in ("title", "default"):
+            strict[key] = to_strict_json_schema(value)
+
+    if strict.get("type") == "object":
+        strict["additionalProperties"] = False
+        strict["required"] = list(strict.get("properties", {}))
+    return strict
+
+
+@functools.lru_cache(maxsize=None)
+def get_response_format(pydantic_object: Type[BaseModel]) -> dict | None:
+    """
+    Builds the `json_schema` response format for the given pydantic object.
+    Returns None if the object can't be expressed as a strict schema, in which
+    case the caller should fall back to `json_object` and format instructions.
+    """
+    try:
+        schema = to_strict_json_schema(pydantic_object.model_json_schema())
+    except ValueError as e:
+        logger.warning(
+            "Not using structured outputs for %s: %s", pydantic_object.__name__, e
+        )
+        return None
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": pydantic_object.__name__,
+            "schema": schema,
+            "strict": True,
+        },
+    }
 
 
 # This can be used for synchronous testing without making an actual API call
@@ -154,6 +240,7 @@ class AIBlock:
     model = ""
     is_json_response = False
     pydantic_object = None
+    stream_response = False
     template_base_path = "prompts"
 
     def __init__(
@@ -179,22 +266,22 @@ class AIBlock:
             "1",
             "t",
         )
+        # Structured outputs need a model that supports `json_schema` response
+        # formats, so they are opt in. When enabled the schema is enforced by the
+        # API and the format instructions are left out of the prompt.
+        self.structured_output: bool = os.getenv(
+            "LLM_STRUCTURED_OUTPUTS", "false"
+        ).lower() in (
+            "true",
+            "1",
+            "t",
+        )
 
     def load_pydantic_format_instructions(self):
         if self.pydantic_object:
-            schema = self.pydantic_object.schema_json()
-
-            template_dir = os.path.join(
-                os.path.dirname(__file__),
-                "../prompts/techniques/",
-            )
             try:
-                templates_env = Environment(loader=FileSystemLoader(template_dir))
-                prompt_template = templates_env.get_template(
-                    "pydantic_format_instruction.j2"
-                )
-                self.PYDANTIC_FORMAT_INSTRUCTIONS = prompt_template.render(
-                    {"schema": schema}
+                self.PYDANTIC_FORMAT_INSTRUCTIONS = get_pydantic_format_instructions(
+                    self.pydantic_object
                 )
             except Exception as e:
                 logger.error(f"Error loading template: {e}")
@@ -309,7 +396,7 @@ class AIBlock:
             lang_str = ""
             if self.language:
                 lang_str = f"{self.language}."
-            templates_env = Environment(loader=FileSystemLoader(self.templates_dir))
+            templates_env = get_template_env(str(self.templates_dir))
             prompt_template = templates_env.get_template(
                 f"{self.prompt_template_name}/{lang_str}{template}.j2"
             )
@@ -320,10 +407,10 @@ class AIBlock:
 
     @staticmethod
     def messages_to_prompt_string(messages: list) -> str:
-        prompt = ""
-        for message in messages:
-            prompt += f"### {message['role']}\n\n {message['content']}\n\n"
-        return prompt
+        return "".join(
+            f"### {message['role']}\n\n {message['content']}\n\n"
+            for message in messages
+        )
 
     def parse(self, response: ChatCompletion) -> ValidatedResponse:
         usage_statistics = response.usage
@@ -363,6 +450,13 @@ class AIBlock:
         """
         raise NotImplementedError("Validate Method not implemented")
 
+    def is_generation_complete(self, text: str) -> bool:
+        """
+        Used with `stream_response`, returns True once the partial response holds
+        everything the block needs so the rest of the generation can be skipped.
+        """
+        return False
+
     def get_format_instructions(self) -> str:
         if not self.pydantic_object:
             raise ValueError("pydantic_object not set")
@@ -382,7 +476,14 @@ class AIBlock:
         first_llm_call_id = None
         try:
             invoke_params["will_retry_on_failure"] = True
-            if self.is_json_response:
+            response_format = None
+            if (
+                self.is_json_response
+                and self.structured_output
+                and self.pydantic_object is not None
+            ):
+                response_format = get_response_format(self.pydantic_object)
+            if self.is_json_response and not response_format:
                 invoke_params["format_instructions"] = self.get_format_instructions()
             system_prompt = self.load_template("system", invoke_params)
             user_prompt = self.load_template("user", invoke_params)
@@ -396,7 +497,9 @@ class AIBlock:
                 "max_tokens": 4095,
             }
 
-            if self.is_json_response:
+            if response_format:
+                request_params["response_format"] = response_format
+            elif self.is_json_response:
                 request_params["response_format"] = {"type": "json_object"}
         except Exception as e:
             logger.error(f"Error creating request params: {e}")
@@ -493,11 +596,16 @@ class AIBlock:
 
         if self.verbose:
             logger.info(
-                f"📤 Calling LLM {request_params['model']} with the following input:\n {request_params['messages']}"
+                "📤 Calling LLM %s with the following input:\n %s",
+                request_params["model"],
+                request_params["messages"],
             )
-        response = await self.oai_client.chat(request_params)
+        response = await self.oai_client.chat(
+            request_params,
+            stop_when=self.is_generation_complete if self.stream_response else None,
+        )
         if self.verbose and response:
-            logger.info(f"📥 LLM response: {response}")
+            logger.info("📥 LLM response: %s", response)
         return self.parse(response)
 
     async def on_failed(self, ids: Identifiers, invoke_params: dict):
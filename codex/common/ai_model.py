@@ -1,7 +1,15 @@
 import asyncio
+import functools
+import hashlib
+import json
 import logging
-from typing import Optional
+import os
+import pathlib
+import tempfile
+import time
+from typing import Callable, Optional
 
+import httpx
 import tiktoken
 from dotenv import load_dotenv
 
@@ -9,15 +17,24 @@ load_dotenv()
 logger = logging.getLogger(__name__)
 
 from openai import AsyncOpenAI  # noqa
+from openai.types import CompletionUsage  # noqa
+from openai.types.chat import ChatCompletion, ChatCompletionMessage  # noqa
+from openai.types.chat.chat_completion import Choice  # noqa
 
 
-def num_tokens_from_messages(messages):
-    """Just a rough estimate here."""
+@functools.lru_cache(maxsize=1)
+def get_token_encoding() -> tiktoken.Encoding:
+    """Resolve the tokenizer once, on first use rather than on every request."""
     try:
-        encoding = tiktoken.encoding_for_model("gpt-4o")
+        return tiktoken.encoding_for_model("gpt-4o")
     except KeyError:
-        print("Warning: model not found. Using cl100k_base encoding.")
-        encoding = tiktoken.get_encoding("cl100k_base")
+        logger.warning("Model not found. Using cl100k_base encoding.")
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def num_tokens_from_messages(messages):
+    """Just a rough estimate here."""
+    encoding = get_token_encoding()
 
     tokens_per_message = 3
     tokens_per_name = 1
@@ -51,11 +68,30 @@ class OpenAIChatClient:
     def configure(
         cls,
         openai_config,
-        max_concurrent_ops=100,
+        max_concurrent_ops=None,
         max_requests_per_min=10_000,
         max_tokens_per_min=1_500_000,
     ):
         if cls._instance is None:
+            if max_concurrent_ops is None:
+                max_concurrent_ops = int(os.environ.get("LLM_CONCURRENCY_LIMIT", 100))
+            # One shared client for the whole process, so every block reuses the
+            # same connection pool. Retries and timeouts are handled by the client.
+            openai_config.setdefault("max_retries", 3)
+            openai_config.setdefault("timeout", 60 * 5)
+            # Keep a warm connection for every request that may run concurrently.
+            # LLM calls are often more than httpx's default 5s keep-alive apart,
+            # which would otherwise mean a new TLS handshake per call.
+            if "http_client" not in openai_config:
+                openai_config["http_client"] = httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=max_concurrent_ops,
+                        max_keepalive_connections=max_concurrent_ops,
+                        keepalive_expiry=60,
+                    ),
+                    timeout=openai_config["timeout"],
+                    follow_redirects=True,
+                )
             if "model" in openai_config:
                 cls.chat_model = openai_config["model"]
                 del openai_config["model"]
@@ -77,9 +113,127 @@ class OpenAIChatClient:
             raise Exception("Singleton instance needs to be configured first")
         return cls._instance
 
+    @staticmethod
+    def _cache_path(req_params) -> pathlib.Path | None:
+        """
+        Path of the cached response for the given request, if caching is enabled.
+
+        Setting `LLM_CACHE_DIR` turns on an exact-match response cache on disk,
+        keyed on the full request (model, messages, max_tokens, response_format).
+        This is meant for development loops where the same prompts are re-run.
+        """
+        cache_dir = os.environ.get("LLM_CACHE_DIR")
+        if not cache_dir:
+            return None
+        key = hashlib.sha256(
+            json.dumps(req_params, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        return pathlib.Path(cache_dir) / f"{key}.json"
+
+    @staticmethod
+    def _read_cache(cache_path: pathlib.Path) -> ChatCompletion | None:
+        """
+        Returns the cached response at `cache_path`, or None on a miss. An entry
+        that can't be read or decoded is treated as a miss.
+        """
+        try:
+            return ChatCompletion.model_validate_json(cache_path.read_text())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable LLM cache entry %s: %s", cache_path, e)
+            return None
+
+    @staticmethod
+    def _write_cache(cache_path: pathlib.Path, response: ChatCompletion) -> None:
+        """
+        Writes the response to `cache_path` atomically, so concurrent readers of
+        the same key never see a partially written file.
+        """
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = tempfile.NamedTemporaryFile(
+            "w", dir=cache_path.parent, suffix=".tmp", delete=False
+        )
+        try:
+            with tmp_file:
+                tmp_file.write(response.model_dump_json())
+            os.replace(tmp_file.name, cache_path)
+        except Exception:
+            # Don't leave partial entries behind in the cache directory
+            os.unlink(tmp_file.name)
+            raise
+
+    @staticmethod
+    async def _stream_until(
+        client: "OpenAIChatClient", req_params, stop_when: Callable[[str], bool]
+    ) -> ChatCompletion:
+        """
+        Streams the completion and stops reading as soon as `stop_when` accepts the
+        text received so far, so tokens the model writes past that point are never
+        generated. Usage is estimated locally as the stream may be cut short.
+
+        `stop_when` is only checked when a chunk contains a backtick, i.e. when a
+        code fence may have been opened or closed, so a long response is not
+        rescanned on every token.
+        """
+        stream = await client.openai.chat.completions.create(**req_params, stream=True)
+        chunks: list[str] = []
+        completion_id = ""
+        finish_reason = "stop"
+        try:
+            async for chunk in stream:
+                completion_id = chunk.id
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                if choice.finish_reason:
+                    finish_reason = choice.finish_reason
+                delta = choice.delta.content
+                if delta:
+                    chunks.append(delta)
+                    if "`" in delta and stop_when("".join(chunks)):
+                        break
+        finally:
+            await stream.close()
+
+        text = "".join(chunks)
+
+        prompt_tokens = num_tokens_from_messages(req_params["messages"])
+        completion_tokens = len(get_token_encoding().encode(text))
+        return ChatCompletion(
+            id=completion_id,
+            created=int(time.time()),
+            model=req_params["model"],
+            object="chat.completion",
+            choices=[
+                Choice(
+                    index=0,
+                    finish_reason=finish_reason,
+                    message=ChatCompletionMessage(role="assistant", content=text),
+                )
+            ],
+            usage=CompletionUsage(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                total_tokens=prompt_tokens + completion_tokens,
+            ),
+        )
+
     @classmethod
-    async def chat(cls, req_params):
+    async def chat(cls, req_params, stop_when: Callable[[str], bool] | None = None):
         client = cls.get_instance()
+        if cls.chat_model:
+            req_params["model"] = cls.chat_model
+        if cls.max_tokens:
+            req_params["max_tokens"] = cls.max_tokens
+
+        cache_path = cls._cache_path(req_params)
+        if cache_path:
+            cached = await asyncio.to_thread(cls._read_cache, cache_path)
+            if cached:
+                logger.debug("LLM cache hit: %s", cache_path.name)
+                return cached
+
         MAX_COMPLETION_TOKENS = 4095
         num_of_tokens_needed = (
             num_tokens_from_messages(req_params["messages"]) + MAX_COMPLETION_TOKENS
@@ -99,16 +253,17 @@ class OpenAIChatClient:
                 cls._total_tokens_count = 0
                 cls._last_request_time = current_time
 
-            if cls.chat_model:
-                req_params["model"] = cls.chat_model
-            if cls.max_tokens:
-                req_params["max_tokens"] = cls.max_tokens
-
-            response = await client.openai.chat.completions.create(**req_params)
+            if stop_when:
+                response = await cls._stream_until(client, req_params, stop_when)
+            else:
+                response = await client.openai.chat.completions.create(**req_params)
             if response.usage and response.usage.total_tokens:
                 cls._total_tokens_count += response.usage.total_tokens
 
-            return response
+        if cache_path:
+            await asyncio.to_thread(cls._write_cache, cache_path, response)
+
+        return response
 
     def __init__(self, openai_config):
         if OpenAIChatClient._configured:
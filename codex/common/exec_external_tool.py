@@ -66,10 +66,10 @@ async def exec_external_on_contents(
             )
             result = await r.communicate()
             stdout, stderr = result[0].decode("utf-8"), result[1].decode("utf-8")
-            logger.debug(f"Output: {stdout}")
+            logger.debug("Output: %s", stdout)
             if temp_file_path in stdout:
                 stdout = stdout  # .replace(temp_file.name, "/generated_file")
-                logger.debug(f"Errors: {stderr}")
+                logger.debug("Errors: %s", stderr)
                 if output_type == OutputType.STD_OUT:
                     errors = stdout
                 elif output_type == OutputType.STD_ERR:
@@ -1,5 +1,8 @@
+import atexit
 import logging.config
+import logging.handlers
 import os
+import queue
 
 import coloredlogs
 
@@ -9,6 +12,14 @@ def setup_logging():
     file_path = os.path.abspath(__file__)
     cloud_config = os.path.join(os.path.dirname(file_path), "log_config_cloud.ini")
     if local_mode:
+        root_logger = logging.getLogger()
+        if any(
+            isinstance(handler, logging.handlers.QueueHandler)
+            for handler in root_logger.handlers
+        ):
+            # Already set up, setup_logging is called from several entry points
+            return
+
         log_format = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
         # Set up basic configuration with standard output
         logging.basicConfig(level=logging.INFO, format=log_format)
@@ -25,8 +36,18 @@ def setup_logging():
         err_file_handler.setFormatter(logging.Formatter(log_format))
 
         # Add the file handler to the root logger
-        logging.getLogger().addHandler(file_handler)
-        logging.getLogger().addHandler(err_file_handler)
+        root_logger.addHandler(file_handler)
+        root_logger.addHandler(err_file_handler)
+
+        # Hand records off to a listener thread so console and file writes
+        # don't block the event loop. Stopping it at exit flushes queued records.
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(
+            log_queue, *root_logger.handlers, respect_handler_level=True
+        )
+        root_logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+        listener.start()
+        atexit.register(listener.stop)
     else:
         logging.config.fileConfig(cloud_config)
 
@@ -115,7 +115,6 @@ async def create_object_type(
         return available_objects
 
     if object.Fields is None:
-        print(f"Fields is None and should be an array. \n {object}")
         raise AssertionError(f"Fields is None and should be an array. \n {object}")
     fields = object.Fields
 
@@ -181,7 +180,7 @@ async def create_object_type(
             if field.RelatedTypes is None:
                 raise AssertionError("RelatedTypes should be an array")
 
-            if object.name in [f.name for f in field.RelatedTypes]:
+            if any(f.name == object.name for f in field.RelatedTypes):
                 continue
 
             # Link created_object_type.id to the field.RelatedTypes
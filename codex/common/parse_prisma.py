@@ -1,7 +1,7 @@
 import re
 from typing import Dict, List, Optional, Union
 
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, field_validator
 
 
 class FieldInfo(BaseModel):
@@ -28,7 +28,8 @@ class DatasourceInfo(BaseModel):
     url: str
     extensions: Optional[List[str]] = None
 
-    @validator("provider")
+    @field_validator("provider")
+    @classmethod
     def validate_provider(cls, v):
         if v not in ["postgresql", "mysql", "sqlite"]:
             raise ValueError(f"Invalid datasource provider: {v}")
@@ -41,7 +42,8 @@ class GeneratorInfo(BaseModel):
     config: Dict[str, Union[str, List[str]]]
     definition: str
 
-    @validator("provider")
+    @field_validator("provider")
+    @classmethod
     def validate_provider(cls, v):
         if v not in ["prisma-client-py", "prisma-docs", "prisma-dbml-generator"]:
             raise ValueError(f"Invalid generator provider: {v}")
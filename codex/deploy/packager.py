@@ -1,3 +1,5 @@
+import asyncio
+import io
 import logging
 import os
 import tempfile
@@ -81,12 +83,10 @@ def generate_dotenv_example_file(application: Application) -> str:
         raise ValueError("Application must have at least one compiled route")
 
     random_username, random_password = codex.common.utils.generate_db_credentials()
-    # normalized app name. keeping only a-z and _
-    db_name: str = (
-        application.completed_app.name.lower().replace(" ", "_").replace("-", "_")
+    # normalized app name, keeping only letters in a single pass
+    db_name: str = "".join(
+        c for c in application.completed_app.name.lower() if c.isalpha()
     )
-    # regex to keep only a-z and _
-    db_name = "".join([c if c.isalpha() else "" for c in db_name])
     env_example = """
 # Example .env file
 # Copy this file to .env and fill in the values for the environment variables
@@ -304,6 +304,69 @@ async def create_github_repo(application: Application) -> tuple[str, str]:
                 raise Exception(f"Failed to create repository: {response.text}")
 
 
+def write_files(files: dict[Path, str]) -> None:
+    """
+    Writes each file in `files`, creating parent directories as needed
+    Args:
+        files (dict[Path, str]): Mapping of file path to file content
+    """
+    for directory in {path.parent for path in files}:
+        directory.mkdir(parents=True, exist_ok=True)
+    for path, content in files.items():
+        path.write_text(content)
+
+
+async def write_package_files(
+    application: Application, spec: Specification, package_dir: Path, hostApp: bool
+) -> None:
+    """
+    Writes all the files of the application package into `package_dir`
+    Args:
+        application (Application): The application to be packaged
+        spec (Specification): The specification of the application
+        package_dir (Path): The directory to write the package files to
+        hostApp (bool): Whether the app is deployed by us, used for the deploy workflow
+    """
+    app_dir = package_dir / "project"
+    github_workflows_directory = package_dir / ".github" / "workflows"
+
+    dotenv_example = generate_dotenv_example_file(application)
+    files: dict[Path, str] = {
+        package_dir / "README.md": generate_readme(application, spec),
+        package_dir / "Dockerfile": DOCKERFILE,
+        app_dir / "__init__.py": "",
+        app_dir / "server.py": application.server_code,
+        package_dir / "backend_chat.sh": script,
+        package_dir / ".env.example": dotenv_example,
+        # Also create .env for convenience
+        package_dir / ".env": dotenv_example,
+        package_dir / ".gitignore": generate_gitignore_file(),
+        package_dir / "docker-compose.yml": generate_docker_compose_file(application),
+        github_workflows_directory / "deploy.yml": generate_actions_workflow(
+            application, hostApp
+        ),
+    }
+    if application.app_code:
+        files[app_dir / "app.py"] = application.app_code
+
+    # Make all the service files
+    for compiled_route in application.get_compiled_routes():
+        files[app_dir / compiled_route.fileName] = compiled_route.compiledCode
+
+    prisma_schema = await create_prisma_schema_file(spec)
+    if prisma_schema:
+        files[package_dir / "schema.prisma"] = prisma_schema
+
+    # Write everything in one pass off the event loop
+    await asyncio.to_thread(write_files, files)
+
+    # Create pyproject.toml and poetry.lock
+    logger.info("Creating pyproject.toml")
+    await create_pyproject(application=application, package_dir=package_dir)
+    logger.info("Creating poetry.lock")
+    await poetry_lock(package_dir)
+
+
 async def create_zip_file(application: Application, spec: Specification) -> bytes:
     """
     Creates a zip file from the application
@@ -323,76 +386,8 @@ async def create_zip_file(application: Application, spec: Specification) -> byte
     try:
         with tempfile.TemporaryDirectory() as package_dir:
             package_dir = Path(package_dir)
-            app_dir = package_dir / "project"
-            app_dir.mkdir(parents=True, exist_ok=True)
-
-            # Make a readme file
-            readme_file = package_dir / "README.md"
-            readme_file.write_text(generate_readme(application, spec))
-
-            dockerfile = package_dir / "Dockerfile"
-            dockerfile.write_text(DOCKERFILE)
-
-            # Make a __init__.py file
-            init_file = app_dir / "__init__.py"
-            init_file.touch()
-
-            # Make a server.py file
-            server_file = app_dir / "server.py"
-            server_file.write_text(application.server_code)
-
-            # Make a chat script file
-            chat_file = package_dir / "backend_chat.sh"
-            chat_file.write_text(script)
-
-            # Make a app.py file
-            if application.app_code:
-                app_file = app_dir / "app.py"
-                app_file.write_text(application.app_code)
-
-            # Make all the service files
-            for compiled_route in application.get_compiled_routes():
-                service_file = app_dir / compiled_route.fileName
-                service_file.write_text(compiled_route.compiledCode)
-
-            # Create pyproject.toml and poetry.lock
-            logger.info("Creating pyproject.toml")
-            await create_pyproject(application=application, package_dir=package_dir)
-            logger.info("Creating poetry.lock")
-            await poetry_lock(package_dir)
-
-            # Make a prisma schema file
-            prisma_schema_file = package_dir / "schema.prisma"
-            prisma_schema = await create_prisma_schema_file(spec)
-            if prisma_schema:
-                prisma_schema_file.write_text(prisma_schema)
-
-            # Make a .env.example file
-            dotenv_example_file = package_dir / ".env.example"
-            dotenv_example = generate_dotenv_example_file(application)
-            dotenv_example_file.write_text(dotenv_example)
-
-            # Also create .env for convenience
-            dotenv_file = package_dir / ".env"
-            dotenv_file.write_text(dotenv_example)
-
-            # Make a .gitignore file
-            gitignore_file = package_dir / ".gitignore"
-            gitignore = generate_gitignore_file()
-            gitignore_file.write_text(gitignore)
-
-            # Make a docker-compose.yml file
-            docker_compose_file = package_dir / "docker-compose.yml"
-            docker_compose = generate_docker_compose_file(application)
-            docker_compose_file.write_text(docker_compose)
-
-            # Make a GitHub actions deploy file
-            github_workflows_directory = package_dir / ".github" / "workflows"
-            github_workflows_directory.mkdir(parents=True, exist_ok=True)
-
-            github_deploy_workflow_path = github_workflows_directory / "deploy.yml"
-            github_deploy_workflow_path.write_text(
-                generate_actions_workflow(application, hostApp=False)
+            await write_package_files(
+                application, spec, package_dir=package_dir, hostApp=False
             )
 
             # Initialize a Git repository and commit everything
@@ -400,16 +395,18 @@ async def create_zip_file(application: Application, spec: Specification) -> byte
 
             logger.info("Created server code")
 
-            # Create a zip file of the directory
-            zip_file_path = app_dir / "server.zip"
-            with zipfile.ZipFile(zip_file_path, "w") as zipf:
-                for file in package_dir.rglob("*"):
-                    if file.is_file() and file.name != "server.zip":
-                        zipf.write(file, file.relative_to(package_dir))
+            # Create a compressed zip of the directory in memory
+            zip_buffer = io.BytesIO()
+            with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zipf:
+                # os.walk reads file types from the directory entries, so files
+                # don't need an extra stat each to tell them apart from folders
+                for root, _, file_names in os.walk(package_dir):
+                    for file_name in file_names:
+                        file_path = os.path.join(root, file_name)
+                        zipf.write(file_path, os.path.relpath(file_path, package_dir))
             logger.info("Created zip file")
 
-            # Read and return the bytes of the zip file
-            return zip_file_path.read_bytes()
+            return zip_buffer.getvalue()
     except Exception as e:
         logger.exception(e)
         raise e
@@ -487,76 +484,8 @@ async def create_remote_repo(
     try:
         with tempfile.TemporaryDirectory() as package_dir:
             package_dir = Path(package_dir)
-            app_dir = package_dir / "project"
-            app_dir.mkdir(parents=True, exist_ok=True)
-
-            # Make a readme file
-            readme_file = package_dir / "README.md"
-            readme_file.write_text(generate_readme(application, spec))
-
-            dockerfile = package_dir / "Dockerfile"
-            dockerfile.write_text(DOCKERFILE)
-
-            # Make a __init__.py file
-            init_file = app_dir / "__init__.py"
-            init_file.touch()
-
-            # Make a server.py file
-            server_file = app_dir / "server.py"
-            server_file.write_text(application.server_code)
-
-            # Make a chat script file
-            chat_file = package_dir / "backend_chat.sh"
-            chat_file.write_text(script)
-
-            # Make a app.py file
-            if application.app_code:
-                app_file = app_dir / "app.py"
-                app_file.write_text(application.app_code)
-
-            # Make all the service files
-            for compiled_route in application.get_compiled_routes():
-                service_file = app_dir / compiled_route.fileName
-                service_file.write_text(compiled_route.compiledCode)
-
-            # Create pyproject.toml and poetry.lock
-            logger.info("Creating pyproject.toml")
-            await create_pyproject(application=application, package_dir=package_dir)
-            logger.info("Creating poetry.lock")
-            await poetry_lock(package_dir)
-
-            # Make a prisma schema file
-            prisma_schema_file = package_dir / "schema.prisma"
-            prisma_schema = await create_prisma_schema_file(spec)
-            if prisma_schema:
-                prisma_schema_file.write_text(prisma_schema)
-
-            # Make a .env.example file
-            dotenv_example_file = package_dir / ".env.example"
-            dotenv_example = generate_dotenv_example_file(application)
-            dotenv_example_file.write_text(dotenv_example)
-
-            # Also create .env for convenience
-            dotenv_file = package_dir / ".env"
-            dotenv_file.write_text(dotenv_example)
-
-            # Make a .gitignore file
-            gitignore_file = package_dir / ".gitignore"
-            gitignore = generate_gitignore_file()
-            gitignore_file.write_text(gitignore)
-
-            # Make a docker-compose.yml file
-            docker_compose_file = package_dir / "docker-compose.yml"
-            docker_compose = generate_docker_compose_file(application)
-            docker_compose_file.write_text(docker_compose)
-
-            # Make a GitHub actions deploy file
-            github_workflows_directory = package_dir / ".github" / "workflows"
-            github_workflows_directory.mkdir(parents=True, exist_ok=True)
-
-            github_deploy_workflow_path = github_workflows_directory / "deploy.yml"
-            github_deploy_workflow_path.write_text(
-                generate_actions_workflow(application, hostApp)
+            await write_package_files(
+                application, spec, package_dir=package_dir, hostApp=hostApp
             )
 
             # Initialize a Git repository and commit everything
@@ -199,7 +199,7 @@ async def develop_user_interface(ids: Identifiers) -> CompletedApp:
         functions_code.append(func.template)
 
     ai_block = PageDecompositionBlock()
-    frontend_spec = await ai_block.invoke(
+    decompose_pages = ai_block.invoke(
         ids=ids,
         invoke_params={
             "available_functions": {f.functionName: f for f in available_functions},
@@ -209,10 +209,14 @@ async def develop_user_interface(ids: Identifiers) -> CompletedApp:
 
     # Connect db table from the existing spec to the new spec
     if completed_app.specificationId:
-        backend_spec = await get_specification(
-            ids.user_id, ids.app_id, completed_app.specificationId
+        # The backend spec lookup doesn't depend on the LLM call, run them together.
+        frontend_spec, backend_spec = await asyncio.gather(
+            decompose_pages,
+            get_specification(ids.user_id, ids.app_id, completed_app.specificationId),
         )
         frontend_spec.DatabaseSchema = backend_spec.DatabaseSchema
+    else:
+        frontend_spec = await decompose_pages
 
     return await develop_application(ids, frontend_spec, lang="nicegui")
 
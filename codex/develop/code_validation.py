@@ -1,4 +1,5 @@
 import ast
+import asyncio
 import collections
 import datetime
 import json
@@ -43,6 +44,13 @@ from codex.requirements.matching import find_best_match
 
 logger = logging.getLogger(__name__)
 
+BLACK_MODE = black.FileMode()
+
+# Linter output, e.g. "file.py:12:5: F821 Undefined name `x`" and "Found 3 errors."
+LINTER_ERROR_PATTERN = re.compile(r"(.+):(\d+):(\d+): (.+)")
+LINTER_SUMMARY_PATTERN = re.compile(r"Found \d+ errors?\.*")
+UNDEFINED_NAME_PATTERN = re.compile(r"Undefined name `(.+?)`")
+
 
 class CodeValidator:
     def __init__(
@@ -95,7 +103,7 @@ class CodeValidator:
 
         for formatter in [
             lambda code: isort.code(code),
-            lambda code: black.format_str(code, mode=black.FileMode()),
+            lambda code: black.format_str(code, mode=BLACK_MODE),
         ]:
             try:
                 code = formatter(code)
@@ -140,7 +148,15 @@ class CodeValidator:
             if "async lambda" in raw_code:
                 error += "\nAsync lambda is not supported in Python. Please use async def instead."
 
-            if line := re.search(r"line (\d+)", error):
+            # Syntax errors carry the exact span of the offending code
+            if isinstance(e, SyntaxError) and e.lineno:
+                raise LineValidationError(
+                    error=error,
+                    code=raw_code,
+                    line_from=e.lineno,
+                    line_to=(e.end_lineno or e.lineno) + 1,
+                )
+            elif line := re.search(r"line (\d+)", error):
                 raise LineValidationError(
                     error=error, code=raw_code, line_from=int(line.group(1))
                 )
@@ -159,8 +175,10 @@ class CodeValidator:
         )
 
         # Add implemented functions into the main function, only link the stub functions
-        deps_funcs = [f for f in visitor.functions if f.is_implemented]
-        stub_funcs = [f for f in visitor.functions if not f.is_implemented]
+        deps_funcs: list[FunctionDef] = []
+        stub_funcs: list[FunctionDef] = []
+        for f in visitor.functions:
+            (deps_funcs if f.is_implemented else stub_funcs).append(f)
 
         objects_block = zip(
             ["\n\n" + generate_object_code(obj) for obj in visitor.objects],
@@ -198,17 +216,13 @@ class CodeValidator:
             function_template = None
 
         # Validate that code is not re-declaring any existing entities.
-        already_declared_entities = set(
-            [
-                obj.name
-                for obj in visitor.objects
-                if obj.name in self.available_objects.keys()
-            ]
-            + [
-                func.name
-                for func in visitor.functions
-                if func.name in self.available_functions.keys()
-            ]
+        already_declared_entities = {
+            obj.name for obj in visitor.objects if obj.name in self.available_objects
+        }
+        already_declared_entities.update(
+            func.name
+            for func in visitor.functions
+            if func.name in self.available_functions
         )
         if not already_declared_entities:
             validation_errors.append(
@@ -225,7 +239,7 @@ class CodeValidator:
             available_objects=self.available_objects,
             available_functions=self.available_functions,
             rawCode=function_code,
-            imports=visitor.imports.copy(),
+            imports=visitor.imports,
             objects=[],  # Objects will be bundled in the function_code instead.
             template=function_template or "",
             functionCode=function_code,
@@ -379,7 +393,7 @@ async def __execute_ruff(
             v
             for v in str(e).split("\n")
             if v.strip()
-            if re.match(r"Found \d+ errors?\.*", v) is None
+            if LINTER_SUMMARY_PATTERN.match(v) is None
         ]
 
         added_imports, error_messages = await __fix_missing_imports(
@@ -388,9 +402,8 @@ async def __execute_ruff(
 
         # Append problematic line to the error message or add it as TODO line
         validation_errors: list[ValidationError] = []
-        split_pattern = r"(.+):(\d+):(\d+): (.+)"
         for error_message in error_messages:
-            error_split = re.match(split_pattern, error_message)
+            error_split = LINTER_ERROR_PATTERN.match(error_message)
 
             if not error_split:
                 error = ValidationError(error_message)
@@ -502,41 +515,59 @@ async def __execute_pyright(
             logger.error(f"Error parsing pyright output, error: {e} output: {result}")
             raise e
 
-        for e in json_response:
-            rule: str = e.get("rule", "")
-            severity: str = e.get("severity", "")
-            excluded_rules = ["reportRedeclaration"]
-            if add_todo_on_error:
-                excluded_rules += [
-                    "reportMissingImports",
-                    "reportOptional",  # TODO: improve prompt and enable this.
-                ]
-            if use_prisma:
-                excluded_rules += ["reportArgumentType"]
+        excluded_rules = ["reportRedeclaration"]
+        if add_todo_on_error:
+            excluded_rules += [
+                "reportMissingImports",
+                "reportOptional",  # TODO: improve prompt and enable this.
+            ]
+        if use_prisma:
+            excluded_rules += ["reportArgumentType"]
+
+        diagnostics = [
+            e
+            for e in json_response
+            if e.get("severity", "") == "error"
+            and not any([e.get("rule", "").startswith(r) for r in excluded_rules])
+        ]
+        error_keys = [
+            (e.get("rule", ""), f"{e['message']}. {e.get('rule', '')}")
+            for e in diagnostics
+        ]
 
-            if severity != "error" or any([rule.startswith(r) for r in excluded_rules]):
-                continue
+        # Grab any enhancements we can for the errors, each enhancement is an
+        # independent LLM call so they are requested concurrently.
+        # The same error reported on several lines is only enhanced once.
+        if not diagnostics:
+            error_enhancements = []
+        elif not func.function_id:
+            logger.warning("Skip add enhancements, function_id is not available")
+            error_enhancements = [None] * len(diagnostics)
+        else:
+            ids = await get_ids_from_function_id_and_compiled_route(
+                func.function_id, compiled_route_id=func.compiled_route_id
+            )
+            unique_keys = list(dict.fromkeys(error_keys))
+            enhancements = await asyncio.gather(
+                *[
+                    get_error_enhancements(rule, msg, py_path, ids)
+                    for rule, msg in unique_keys
+                ]
+            )
+            enhancements_by_key = dict(zip(unique_keys, enhancements))
+            error_enhancements = [enhancements_by_key[key] for key in error_keys]
 
-            # Grab any enhancements we can for the error
-            error_message: str = f"{e['message']}. {e.get('rule', '')}"
-            if not func.function_id:
-                logger.warning("Skip add enhancements, function_id is not available")
-                error_enhancements = None
-            else:
-                ids = await get_ids_from_function_id_and_compiled_route(
-                    func.function_id, compiled_route_id=func.compiled_route_id
-                )
-                error_enhancements = await get_error_enhancements(
-                    rule, error_message, py_path, ids
+        for e, (_, error_message), enhancements in zip(
+            diagnostics, error_keys, error_enhancements
+        ):
+            validation_errors.append(
+                LineValidationError(
+                    error=error_message,
+                    code=code,
+                    line_from=e["range"]["start"]["line"] + 1,
+                    enhancements=enhancements,
                 )
-
-            e = LineValidationError(
-                error=error_message,
-                code=code,
-                line_from=e["range"]["start"]["line"] + 1,
-                enhancements=error_enhancements,
             )
-            validation_errors.append(e)
 
         # read code from code.py. split the code into imports and raw code
         code = open(f"{temp_dir}/code.py").read()
@@ -797,8 +828,7 @@ async def __fix_missing_imports(
     missing_imports = []
     filtered_errors = []
     for error in errors:
-        pattern = r"Undefined name `(.+?)`"
-        match = re.search(pattern, error)
+        match = UNDEFINED_NAME_PATTERN.search(error)
         if not match:
             filtered_errors.append(error)
             continue
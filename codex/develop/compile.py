@@ -1,4 +1,6 @@
 import ast
+import asyncio
+import dataclasses
 import logging
 import re
 from datetime import datetime
@@ -15,25 +17,27 @@ from prisma.models import (
     Specification,
 )
 from prisma.types import CompiledRouteUpdateInput
-from pydantic import BaseModel
 
 from codex.common.database import INCLUDE_FIELD, INCLUDE_FUNC, get_database_schema
 from codex.common.exec_external_tool import DEFAULT_DEPS
 from codex.common.types import normalize_type
 from codex.deploy.model import Application
 from codex.develop.code_validation import CodeValidator
-from codex.develop.database import get_compiled_route, get_deliverable
+from codex.develop.database import get_deliverable
 from codex.develop.function import generate_object_template
 from codex.develop.model import Package as PackageModel
 
 logger = logging.getLogger(__name__)
 
+PATH_PARAM_PATTERN = re.compile(r"\{(.*?)\}")
 
-class CompiledFunction(BaseModel):
+
+@dataclasses.dataclass(slots=True)
+class CompiledFunction:
     packages: List[Package]
     imports: List[str]
     code: str
-    pydantic_models: List[str] = []
+    pydantic_models: List[str] = dataclasses.field(default_factory=list)
 
 
 class ComplicationFailure(Exception):
@@ -56,7 +60,10 @@ async def compile_route(
     Returns:
         CompiledRoute: The compiled route object.
     """
-    compiled_function = await recursive_compile_route(route_root_func, set())
+    functions = await get_function_tree(route_root_func.id)
+    compiled_function = await recursive_compile_route(
+        route_root_func, set(), functions, {}, {}
+    )
 
     unique_packages = {
         package.id: PackageModel(
@@ -66,13 +73,21 @@ async def compile_route(
         )
         for package in compiled_function.packages
     }
-    code = "\n".join(compiled_function.imports)
-    code += "\n\n"
-    code += "\n\n".join(compiled_function.pydantic_models)
-    code += "\n\n"
-    code += compiled_function.code
+    code = "\n\n".join(
+        [
+            "\n".join(compiled_function.imports),
+            "\n\n".join(compiled_function.pydantic_models),
+            compiled_function.code,
+        ]
+    )
+    # Check the code of the whole route once, rather than at every recursion level
+    try:
+        ast.parse(code)
+    except Exception as e:
+        raise ValueError(
+            f"Syntax error in function code: {e}, {compiled_function.code}"
+        )
 
-    compiled_route = await get_compiled_route(compiled_route_id)
     database_schema = get_database_schema(spec)
     available_functions[route_root_func.functionName] = route_root_func
     # Run the auto-fixers
@@ -117,7 +132,7 @@ def add_full_import_parth_to_custom_types(module_name: str, arg: ObjectField) ->
         return arg.typeName
 
     ret_type = arg.typeName
-    logger.debug(f"Arg name: {arg.name}, arg type: {arg.typeName}")
+    logger.debug("Arg name: %s, arg type: %s", arg.name, arg.typeName)
 
     # For each related type, replace the type name with the full import path
     renamed_types: dict[str, str] = {}
@@ -131,8 +146,62 @@ def add_full_import_parth_to_custom_types(module_name: str, arg: ObjectField) ->
     return ret_type
 
 
+async def get_function_tree(root_function_id: str) -> dict[str, Function]:
+    """
+    Fetches a function and all of its descendants, keyed by function id.
+
+    Prisma can't include a relation recursively, so the tree is fetched one level
+    at a time: a single query per depth instead of one per function.
+
+    Args:
+        root_function_id (str): The id of the function at the root of the tree.
+
+    Returns:
+        dict[str, Function]: The functions of the tree by id.
+    """
+    functions: dict[str, Function] = {}
+    level_ids = [root_function_id]
+    while level_ids:
+        level = await Function.prisma().find_many(
+            where={"id": {"in": level_ids}},
+            include={
+                **INCLUDE_FUNC["include"],
+                "ChildFunctions": True,
+                "Packages": True,
+            },  # type: ignore
+        )
+        functions.update((function.id, function) for function in level)
+        level_ids = [
+            child.id
+            for function in level
+            for child in function.ChildFunctions or []
+            if child.id not in functions
+        ]
+    return functions
+
+
+def get_object_template(obj_type: ObjectType, object_templates: dict[str, str]) -> str:
+    """
+    Generates the template of an object type, once per compilation run.
+
+    Args:
+        obj_type (ObjectType): The object type to generate the template for.
+        object_templates (dict[str, str]): The templates generated so far, by id.
+
+    Returns:
+        str: The object type template.
+    """
+    if obj_type.id not in object_templates:
+        object_templates[obj_type.id] = generate_object_template(obj_type)
+    return object_templates[obj_type.id]
+
+
 async def recursive_compile_route(
-    in_function: Function, object_type_ids: Set[str]
+    in_function: Function,
+    object_type_ids: Set[str],
+    functions: dict[str, Function],
+    object_templates: dict[str, str],
+    object_types: dict[str, asyncio.Task[ObjectType]],
 ) -> CompiledFunction:
     """
     Recursively compiles a function and its child functions
@@ -141,110 +210,141 @@ async def recursive_compile_route(
     Args:
         ids (Identifiers): The identifiers for the function.
         function (Function): The function to compile.
+        functions (dict[str, Function]): The prefetched function tree,
+            see `get_function_tree`.
+        object_templates (dict[str, str]): The object type templates generated
+            during this compilation, see `get_object_template`.
+        object_types (dict[str, asyncio.Task[ObjectType]]): The object types fetched
+            during this compilation, see `fetch_object_type`.
 
     Returns:
         CompiledFunction: The compiled function.
 
     Raises:
-        ValueError: If the function code is missing.
+        ValueError: If the function code is missing or the function was not fetched.
     """
-    # Can't see how to do recursive lookup with prisma, so I'm checking the next
-    # layer down each time. This is a bit of a hack, can be improved later.
-    function = await Function.prisma().find_unique_or_raise(
-        where={"id": in_function.id},
-        include={
-            **INCLUDE_FUNC["include"],
-            "ParentFunction": INCLUDE_FUNC,
-            "ChildFunctions": INCLUDE_FUNC,
-            "Packages": True,
-        },  # type: ignore
-    )
+    function = functions.get(in_function.id)
+    if function is None:
+        raise ValueError(f"Function {in_function.id} is not in the function tree")
     logger.info(f"⚙️ Compiling function: {function.functionName}")
 
     if function.functionCode is None:
         raise ValueError(f"Function code is required! {function.functionName}")
 
-    packages = []
-    imports = []
+    # Keyed by id, so packages shared across the tree are only kept once
+    packages: dict[str, Package] = {}
+    imports: set[str] = set()
     code = []
     model = []
 
     if function.FunctionArgs is not None:
         for arg in function.FunctionArgs:
-            obj_types = await get_object_field_deps(arg, object_type_ids)
-            model.extend([generate_object_template(obj_type) for obj_type in obj_types])
+            obj_types = await get_object_field_deps(arg, object_type_ids, object_types)
+            model.extend(
+                [
+                    get_object_template(obj_type, object_templates)
+                    for obj_type in obj_types
+                ]
+            )
             for obj in obj_types:
-                imports.extend(obj.importStatements)
+                imports.update(obj.importStatements)
 
     if function.FunctionReturn is not None:
         obj_types = await get_object_field_deps(
-            function.FunctionReturn, object_type_ids
+            function.FunctionReturn, object_type_ids, object_types
+        )
+        model.extend(
+            [get_object_template(obj_type, object_templates) for obj_type in obj_types]
         )
-        model.extend([generate_object_template(obj_type) for obj_type in obj_types])
         for obj in obj_types:
-            imports.extend(obj.importStatements)
+            imports.update(obj.importStatements)
 
     # Child Functions
     if function.ChildFunctions is None:
         raise AssertionError("ChildFunctions should be an array")
-    for child_function in function.ChildFunctions:
-        compiled_function = await recursive_compile_route(
-            child_function, object_type_ids
-        )
-        packages.extend(compiled_function.packages)
-        imports.extend(compiled_function.imports)
+    # Children are compiled concurrently, each with its own copy of the processed
+    # object types. Types shared by several children are only fetched once, through
+    # `object_types`, and deduplicated on return keeping their first position so
+    # dependencies stay ahead of their dependents.
+    child_object_type_ids = [set(object_type_ids) for _ in function.ChildFunctions]
+    compiled_children = await asyncio.gather(
+        *[
+            recursive_compile_route(
+                child_function, child_ids, functions, object_templates, object_types
+            )
+            for child_function, child_ids in zip(
+                function.ChildFunctions, child_object_type_ids
+            )
+        ]
+    )
+    for compiled_function, child_ids in zip(compiled_children, child_object_type_ids):
+        object_type_ids.update(child_ids)
+        packages.update((package.id, package) for package in compiled_function.packages)
+        imports.update(compiled_function.imports)
         model.extend(compiled_function.pydantic_models)
         code.append(compiled_function.code)
 
     # Package
     if function.Packages:
-        packages.extend(function.Packages)
+        packages.update((package.id, package) for package in function.Packages)
 
     # Imports
-    imports.extend(function.importStatements)
-    imports = sorted(set(imports))
+    imports.update(function.importStatements)
 
     # Code
     code.append(function.functionCode)
 
-    # Check Code
-    try:
-        check_code = "\n".join(imports)
-        check_code += "\n\n" + "\n\n".join(model)
-        check_code += "\n\n" + "\n\n".join(code)
-        ast.parse(check_code)
-    except Exception as e:
-        raise ValueError(f"Syntax error in function code: {e}, {code}")
-
     return CompiledFunction(
-        packages=packages,
-        imports=imports,
+        packages=list(packages.values()),
+        imports=sorted(imports),
         code="\n\n".join(code),
-        pydantic_models=model,
+        pydantic_models=list(dict.fromkeys(model)),
     )
 
 
+async def fetch_object_type(
+    obj_type_id: str, object_types: dict[str, asyncio.Task[ObjectType]] | None
+) -> ObjectType:
+    """
+    Looks up an object type with all its fields. With `object_types`, each object
+    type is only fetched once, also when it is requested concurrently.
+    """
+    if object_types is None:
+        return await ObjectType.prisma().find_unique_or_raise(
+            where={"id": obj_type_id},
+            **INCLUDE_FIELD,  # type: ignore
+        )
+    if obj_type_id not in object_types:
+        object_types[obj_type_id] = asyncio.create_task(
+            fetch_object_type(obj_type_id, None)
+        )
+    return await object_types[obj_type_id]
+
+
 async def get_object_type_deps(
-    obj_type_id: str, object_type_ids: Set[str]
+    obj_type_id: str,
+    object_type_ids: Set[str],
+    object_types: dict[str, asyncio.Task[ObjectType]] | None = None,
 ) -> List[ObjectType]:
     # Lookup the object getting all its subfields
-    obj = await ObjectType.prisma().find_unique_or_raise(
-        where={"id": obj_type_id},
-        **INCLUDE_FIELD,  # type: ignore
-    )
+    obj = await fetch_object_type(obj_type_id, object_types)
     if obj.Fields is None:
         raise ValueError(f"ObjectType {obj.name} has no fields.")
 
     objects: List[ObjectType] = []
     for field in obj.Fields:
         if field.RelatedTypes:
-            objects.extend(await get_object_field_deps(field, object_type_ids))
+            objects.extend(
+                await get_object_field_deps(field, object_type_ids, object_types)
+            )
 
     return objects + [obj]
 
 
 async def get_object_field_deps(
-    field: ObjectField, object_type_ids: Set[str]
+    field: ObjectField,
+    object_type_ids: Set[str],
+    object_types: dict[str, asyncio.Task[ObjectType]] | None = None,
 ) -> List[ObjectType]:
     """
     Process an object field and return the Pydantic classes
@@ -254,6 +354,8 @@ async def get_object_field_deps(
         field (ObjectField): The object field to process.
         object_type_ids (Set[str]): A set of object type IDs that
                                     have already been processed.
+        object_types (dict[str, asyncio.Task[ObjectType]] | None): The object
+            types fetched so far, see `fetch_object_type`.
 
     Returns:
         List[ObjectType]: The object types generated from the field's type.
@@ -261,11 +363,12 @@ async def get_object_field_deps(
     Raises:
         AssertionError: If the field type is None.
     """
-    # Lookup the field object getting all its subfields
-    field = await ObjectField.prisma().find_unique_or_raise(
-        where={"id": field.id},
-        include={"RelatedTypes": True},
-    )
+    if field.RelatedTypes is None:
+        # Lookup the field object getting all its subfields
+        field = await ObjectField.prisma().find_unique_or_raise(
+            where={"id": field.id},
+            include={"RelatedTypes": True},
+        )
 
     if field.RelatedTypes is None:
         raise AssertionError("Field RelatedTypes should be an array")
@@ -279,24 +382,40 @@ async def get_object_field_deps(
         )
         return []
 
-    logger.debug(f"Processing field {field.name} of type {field.typeName}")
+    logger.debug("Processing field %s of type %s", field.name, field.typeName)
     object_type_ids.update([t.id for t in types])
 
     # TODO: this can run in parallel
     pydantic_classes = []
     for type in types:
-        pydantic_classes.extend(await get_object_type_deps(type.id, object_type_ids))
+        pydantic_classes.extend(
+            await get_object_type_deps(type.id, object_type_ids, object_types)
+        )
 
     return pydantic_classes
 
 
-def create_server_route_code(compiled_route: CompiledRoute) -> str:
+def get_route_handler_name(compiled_route: CompiledRoute) -> str:
+    """
+    Name of the FastAPI handler function generated for a compiled route.
+    """
+    if compiled_route.ApiRouteSpec is None or compiled_route.RootFunction is None:
+        raise ValueError("Compiled route must have an API route spec and root function")
+    http_verb = str(compiled_route.ApiRouteSpec.method).lower()
+    return f"api_{http_verb}_{compiled_route.RootFunction.functionName}"
+
+
+def create_server_route_code(
+    compiled_route: CompiledRoute, handler_name: str | None = None
+) -> str:
     """
     Create the server route code for a compiled route.
 
     Args:
         compiled_route (CompiledRoute): The compiled route to create the
                                         server route code for.
+        handler_name (str | None): Name of the generated handler function,
+                                   defaults to `get_route_handler_name`.
 
     Returns:
         str: The server route code.
@@ -353,9 +472,8 @@ def create_server_route_code(compiled_route: CompiledRoute) -> str:
     route_decorator += ")\n"
 
     # TODO(SwiftyOS): consider replacing the prefix with a proper import and func call.
-    route_function_def = (
-        f"async def api_{http_verb.lower()}_{main_function.functionName}("
-    )
+    handler_name = handler_name or get_route_handler_name(compiled_route)
+    route_function_def = f"async def {handler_name}("
     route_function_def += ", ".join(
         [
             f"{arg.name}: {add_full_import_parth_to_custom_types(module_name, arg)}"
@@ -403,10 +521,7 @@ def create_server_route_code(compiled_route: CompiledRoute) -> str:
             media_type="application/json",
         )
     """
-    route_code = route_decorator
-    route_code += route_function_def
-    route_code += function_body
-    route_code += "\n\n"
+    route_code = f"{route_decorator}{route_function_def}{function_body}\n\n"
 
     try:
         ast.parse(route_code)
@@ -416,6 +531,32 @@ def create_server_route_code(compiled_route: CompiledRoute) -> str:
     return route_code
 
 
+def create_server_routes_code(compiled_routes: List[CompiledRoute]) -> List[str]:
+    """
+    Create the server route code for each compiled route.
+
+    Args:
+        compiled_routes (List[CompiledRoute]): The compiled routes of the app.
+
+    Returns:
+        List[str]: The server route code, in the order of `compiled_routes`.
+    """
+    routes_code = []
+    handler_names: set[str] = set()
+    for compiled_route in compiled_routes:
+        # Routes can share a method and function name, number the repeats so every
+        # handler (and its OpenAPI operation id) stays unique
+        base_handler_name = handler_name = get_route_handler_name(compiled_route)
+        suffix = 1
+        while handler_name in handler_names:
+            handler_name = f"{base_handler_name}_{suffix}"
+            suffix += 1
+        handler_names.add(handler_name)
+
+        routes_code.append(create_server_route_code(compiled_route, handler_name))
+    return routes_code
+
+
 def extract_path_params(path: str) -> List[str]:
     """
     Extracts path parameters from a given path.
@@ -426,8 +567,7 @@ def extract_path_params(path: str) -> List[str]:
     Returns:
         List[str]: A list of path parameters extracted from the path.
     """
-    matches = re.findall(r"\{(.*?)\}", path)
-    return matches
+    return PATH_PARAM_PATTERN.findall(path)
 
 
 DEFAULT_LIBRARIES = [
@@ -524,7 +664,6 @@ app = FastAPI(title="{name}", lifespan=lifespan, description='''{desc}''')
 
 """
 
-    service_routes_code = []
     if completed_app.CompiledRoutes is None:
         raise ValueError("Application must have at least one compiled route.")
 
@@ -542,16 +681,13 @@ app = FastAPI(title="{name}", lifespan=lifespan, description='''{desc}''')
             f"import project.{compiled_route.fileName.replace('.py', '')}"
         )
 
-        service_routes_code.append(create_server_route_code(compiled_route))
-
+    service_routes_code = create_server_routes_code(completed_app.CompiledRoutes)
     packages = resolve_package_requirements(libraries)
 
     # Compile the server code
-    server_code = "\n".join(server_code_imports)
-    server_code += "\n\n"
-    server_code += server_code_header
-    server_code += "\n\n"
-    server_code += "\n\n".join(service_routes_code)
+    server_code = "\n\n".join(
+        ["\n".join(server_code_imports), server_code_header, *service_routes_code]
+    )
 
     db_schema: str = get_database_schema(spec)
 
@@ -1,4 +1,5 @@
 import logging
+import re
 from typing import List
 
 from prisma.enums import DevelopmentPhase, FunctionState
@@ -27,6 +28,20 @@ from codex.develop.model import GeneratedFunctionResponse, Package
 
 logger = logging.getLogger(__name__)
 
+# Opening fences of the blocks in the LLM response
+REQUIREMENTS_FENCE = r"```requirements"
+PYTHON_FENCE = r"```(?:python3?|py3?)\b[^\n]*\n"
+
+# Fenced blocks in the LLM response, an unterminated fence runs to the end of the text
+REQUIREMENTS_BLOCK_PATTERN = re.compile(
+    REQUIREMENTS_FENCE + r"(.*?)(?:```|\Z)", re.DOTALL
+)
+PYTHON_BLOCK_PATTERN = re.compile(PYTHON_FENCE + r"(.*?)(?:```|\Z)", re.DOTALL)
+# A requirements block followed by a closed python block
+COMPLETE_RESPONSE_PATTERN = re.compile(
+    REQUIREMENTS_FENCE + r".*?" + PYTHON_FENCE + r".*?```", re.DOTALL
+)
+
 
 def parse_requirements(requirements_str: str) -> List[Package]:
     """
@@ -74,6 +89,17 @@ class DevelopAIBlock(AIBlock):
     prompt_template_name = "develop"
     model = "gpt-4o"
     language = "python"
+    stream_response = True
+
+    def is_generation_complete(self, text: str) -> bool:
+        """
+        The python prompt asks for the requirements block followed by a single
+        python block, anything after the closing fence of the latter is unused.
+        NiceGUI pages write the python block twice, so they are always read in full.
+        """
+        if self.language != "python":
+            return False
+        return COMPLETE_RESPONSE_PATTERN.search(text) is not None
 
     async def validate(
         self,
@@ -89,8 +115,7 @@ class DevelopAIBlock(AIBlock):
             text = response.response
 
             # Package parsing
-            requirement_blocks = text.split("```requirements")
-            requirement_blocks.pop(0)
+            requirement_blocks = REQUIREMENTS_BLOCK_PATTERN.findall(text)
             if len(requirement_blocks) < 1:
                 packages = []
             elif len(requirement_blocks) > 1:
@@ -100,21 +125,20 @@ class DevelopAIBlock(AIBlock):
                     + "There should be exactly 1"
                 )
             else:
-                packages: List[Package] = parse_requirements(
-                    requirement_blocks[0].split("```")[0]
-                )
+                packages: List[Package] = parse_requirements(requirement_blocks[0])
 
             # Code parsing
-            code_blocks = text.split("```python")
-            code_blocks.pop(0)
+            code_blocks = PYTHON_BLOCK_PATTERN.findall(text)
             if len(code_blocks) == 0:
                 raise ValidationError("No code blocks found in the response")
             elif len(code_blocks) > 1:
+                # Only NiceGUI responses get here, python responses stop streaming
+                # once their first python block is closed
                 logger.warning(
                     f"There are {len(code_blocks)} code blocks in the response. "
                     + "Pick the last one"
                 )
-            code = code_blocks[-1].split("```")[0]
+            code = code_blocks[-1]
             route_errors_as_todo = not invoke_params.get("will_retry_on_failure", True)
             response.response = await CodeValidator(
                 compiled_route_id=invoke_params["compiled_route_id"],
@@ -242,10 +266,11 @@ class DevelopAIBlock(AIBlock):
     async def on_failed(self, ids: Identifiers, invoke_params: dict):
         function_name = invoke_params.get("function_name", "Unknown")
         function_signature = invoke_params.get("function_signature", "Unknown")
+        log_extra = ids.model_dump()
         try:
             logger.error(
                 f"AI Failed to write the function {function_name}. Signature of failed function:\n{function_signature}",
-                extra=ids.model_dump(),
+                extra=log_extra,
             )
             await Function.prisma().update(
                 where={"id": ids.function_id},
@@ -255,14 +280,14 @@ class DevelopAIBlock(AIBlock):
             logger.exception(
                 "Prisma error updating function state to FAILED.",
                 pe,
-                extra=ids.model_dump(),
+                extra=log_extra,
             )
             raise pe
         except Exception as e:
             logger.exception(
                 "Unexpected error updating function state to FAILED.",
                 e,
-                extra=ids.model_dump(),
+                extra=log_extra,
             )
             raise e
 
@@ -5,6 +5,9 @@ from codex.api_model import ObjectFieldModel, ObjectTypeModel
 from codex.common.model import PYTHON_TYPES, FunctionDef
 from codex.develop.function import normalize_type
 
+# Splits the "name: description" entries of a docstring section
+DOC_ENTRY_PATTERN = re.compile(r"\n(\s+.+):")
+
 
 class FunctionVisitor(ast.NodeVisitor):
     """
@@ -38,7 +41,6 @@ class FunctionVisitor(ast.NodeVisitor):
             if alias.asname:
                 import_line += f" as {alias.asname}"
             self.imports.append(import_line)
-        self.generic_visit(node)
 
     def visit_ImportFrom(self, node):
         for alias in node.names:
@@ -46,7 +48,6 @@ class FunctionVisitor(ast.NodeVisitor):
             if alias.asname:
                 import_line += f" as {alias.asname}"
             self.imports.append(import_line)
-        self.generic_visit(node)
 
     def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef):
         # treat async functions as normal functions
@@ -108,8 +109,7 @@ class FunctionVisitor(ast.NodeVisitor):
 
         # Extract Args
         args_descs = {}
-        split_pattern = r"\n(\s+.+):"
-        for match in reversed(list(re.finditer(split_pattern, string=args_doc))):
+        for match in reversed(list(DOC_ENTRY_PATTERN.finditer(args_doc))):
             arg = match.group(1).strip().split(" ")[0]
             desc = args_doc.rsplit(match.group(1), 1)[1].strip(": ")
             args_descs[arg] = desc.strip()
@@ -117,7 +117,7 @@ class FunctionVisitor(ast.NodeVisitor):
 
         # Extract Returns
         return_desc = ""
-        if match := re.match(split_pattern, string=rets_doc):
+        if match := DOC_ENTRY_PATTERN.match(rets_doc):
             return_desc = rets_doc[match.end() :].strip()
 
         self.functions.append(
@@ -185,10 +185,11 @@ class FunctionVisitor(ast.NodeVisitor):
                     self.errors.append(
                         f"Class {node.name} has multiple assignments in a single line."
                     )
+                value = ast.unparse(v.value)
                 field = ObjectFieldModel(
                     name=ast.unparse(v.targets[0]),
-                    type=type(ast.unparse(v.value)).__name__,
-                    value=ast.unparse(v.value) if v.value else None,
+                    type=type(value).__name__,
+                    value=value,
                 )
             elif isinstance(v, ast.Expr) and isinstance(v.value, ast.Constant):
                 # skip comments and docstrings
@@ -226,4 +227,6 @@ class FunctionVisitor(ast.NodeVisitor):
         ) and node.col_offset == 0:
             self.globals.append(ast.unparse(node))
             self.globalsIdx.append(node.lineno)
+            # Nothing we extract can be nested in an assignment, skip its subtree.
+            return
         super().visit(node)
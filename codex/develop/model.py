@@ -55,10 +55,11 @@ class GeneratedFunctionResponse(BaseModel):
         """
         Regenerate imports & raw code using the available objects and functions.
         """
-        imports = self.imports.copy()
-        for obj in self.available_objects.values():
-            imports.extend(obj.importStatements)
-        self.imports = sorted(set(imports))
+        self.imports = sorted(
+            set(self.imports).union(
+                *(obj.importStatements for obj in self.available_objects.values())
+            )
+        )
 
         def __append_comment(code_block: str, comment: str) -> str:
             """
@@ -15,6 +15,11 @@ from codex.interview.model import Action, InterviewResponse, UpdateUnderstanding
 
 logger = logging.getLogger(__name__)
 
+NEXT_PHASE = {
+    prisma.enums.InterviewPhase.FEATURES: prisma.enums.InterviewPhase.ARCHITECT,
+    prisma.enums.InterviewPhase.ARCHITECT: prisma.enums.InterviewPhase.COMPLETED,
+}
+
 
 @traceable
 async def start_interview(
@@ -119,24 +124,13 @@ async def continue_interview(
         # We update the phase based on the last step
         phase = last_step.phase
         if last_step.phase_complete:
-            if last_step.phase == prisma.enums.InterviewPhase.FEATURES:
-                phase = prisma.enums.InterviewPhase.ARCHITECT
-            elif last_step.phase == prisma.enums.InterviewPhase.ARCHITECT:
-                phase = prisma.enums.InterviewPhase.COMPLETED
-            else:
+            if last_step.phase not in NEXT_PHASE:
                 raise ValueError("Invalid phase transition")
+            phase = NEXT_PHASE[last_step.phase]
 
-        if phase == prisma.enums.InterviewPhase.FEATURES:
-            return await continue_feature_phase(ids, app, user_message, last_step)
-        elif phase == prisma.enums.InterviewPhase.ARCHITECT:
-            return await continue_architect_phase(ids, app, user_message, last_step)
-        elif phase == prisma.enums.InterviewPhase.COMPLETED:
-            return InterviewResponse(
-                id=ids.interview_id,
-                say_to_user="The interview is already completed",
-                phase=prisma.enums.InterviewPhase.COMPLETED.value,
-                phase_completed=True,
-            )
+        phase_handler = PHASE_HANDLERS.get(phase)
+        if phase_handler:
+            return await phase_handler(ids, app, user_message, last_step)
     except Exception as e:
         logger.exception(f"Error occurred during interview continuation: {e}")
         raise AssertionError(f"Error during interview continuation: {e}")
@@ -220,12 +214,12 @@ async def continue_architect_phase(
         if not last_step.Features:
             raise AssertionError("Features not found in the last step")
 
-        features_string = ""
-        for feature in last_step.Features:
-            features_string += "\nFeature Name: " + str(feature.name)
-            features_string += "\nFunctionality: " + str(feature.functionality)
-            features_string += "\nReasoning: " + str(feature.reasoning)
-            features_string += "\n"
+        features_string = "".join(
+            f"\nFeature Name: {feature.name}"
+            f"\nFunctionality: {feature.functionality}"
+            f"\nReasoning: {feature.reasoning}\n"
+            for feature in last_step.Features
+        )
 
         logger.info("Defining Modules from features")
 
@@ -310,6 +304,27 @@ async def continue_architect_phase(
         raise AssertionError(f"Error during interview modules continuation: {e}")
 
 
+async def completed_phase(
+    ids: Identifiers,
+    app: prisma.models.Application,
+    user_message: str,
+    last_step: prisma.models.InterviewStep,
+) -> InterviewResponse:
+    return InterviewResponse(
+        id=ids.interview_id,
+        say_to_user="The interview is already completed",
+        phase=prisma.enums.InterviewPhase.COMPLETED.value,
+        phase_completed=True,
+    )
+
+
+PHASE_HANDLERS = {
+    prisma.enums.InterviewPhase.FEATURES: continue_feature_phase,
+    prisma.enums.InterviewPhase.ARCHITECT: continue_architect_phase,
+    prisma.enums.InterviewPhase.COMPLETED: completed_phase,
+}
+
+
 def apply_feature_updates(
     last_step: prisma.models.InterviewStep, update: UpdateUnderstanding
 ) -> list[prisma.types.FeatureCreateWithoutRelationsInput]:
@@ -36,10 +36,9 @@ class InterviewUpdateBlock(AIBlock):
 
     @staticmethod
     def create_feature_list(features: list[prisma.models.Feature]):
-        features_section = ""
-        for i, f in enumerate(features):
-            features_section += f"{i}: {f.name} - {f.functionality}\n"
-        return features_section
+        return "".join(
+            f"{i}: {f.name} - {f.functionality}\n" for i, f in enumerate(features)
+        )
 
     async def validate(
         self, invoke_params: dict, response: ValidatedResponse
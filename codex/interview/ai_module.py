@@ -26,10 +26,9 @@ class ModuleGenerationBlock(codex.common.ai_block.AIBlock):
 
     @staticmethod
     def create_modules_list(features: list[prisma.models.Module]):
-        modules_section = ""
-        for i, f in enumerate(features):
-            modules_section += f"{i}: {f.name} - {f.description}\n"
-        return modules_section
+        return "".join(
+            f"{i}: {f.name} - {f.description}\n" for i, f in enumerate(features)
+        )
 
     async def validate(
         self, invoke_params: dict, response: codex.common.ai_block.ValidatedResponse
@@ -99,20 +99,19 @@ async def generate_requirements(ids: Identifiers, app: Application) -> SpecHolde
 
     spec_holder.features = interview.Features
 
-    features_string = ""
-    for feature in interview.Features:
-        features_string += "\nFeature Name: " + str(feature.name)
-        features_string += "\nFunctionality: " + str(feature.functionality)
-        features_string += "\nReasoning: " + str(feature.reasoning)
-        features_string += "\n"
+    features_string = "".join(
+        f"\nFeature Name: {feature.name}"
+        f"\nFunctionality: {feature.functionality}"
+        f"\nReasoning: {feature.reasoning}\n"
+        for feature in interview.Features
+    )
 
     logger.info("Defining Modules from features")
 
-    modules_string = ""
-    for module in interview.Modules:
-        modules_string += "\nModule Name: " + str(module.name)
-        modules_string += "\nFunctionality: " + str(module.description)
-        modules_string += "\n"
+    modules_string = "".join(
+        f"\nModule Name: {module.name}\nFunctionality: {module.description}\n"
+        for module in interview.Modules
+    )
 
     logger.info("Designing Database")
     # Database Design
@@ -1,6 +1,6 @@
 import logging
 import typing
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, List, Set, Tuple
 
 from codex.api_model import ObjectFieldModel, ObjectTypeModel
 from codex.common.ai_block import (
@@ -93,7 +93,7 @@ ALLOWED_TYPES = sorted(typing.__all__) + [
 def is_valid_type(
     type_name: str,
     object_type_names: Set[str],
-    allowed_types: List[str],
+    allowed_types: Set[str],
 ) -> bool:
     return type_name in object_type_names or type_name in allowed_types
 
@@ -285,24 +285,28 @@ def replace_inner_types(inner_type: str) -> List[str]:
     return replaced_inner_types
 
 
+def index_related_types(model: ObjectTypeModel) -> Dict[str, ObjectTypeModel]:
+    """
+    Maps the name of every type related to the fields of the model to that type,
+    keeping the first one found for each name.
+    """
+    related_types: Dict[str, ObjectTypeModel] = {}
+    for field in model.Fields or []:
+        for related_type in field.related_types or []:
+            related_types.setdefault(related_type.name, related_type)
+    return related_types
+
+
 def copy_object_type(
-    source_model: ObjectTypeModel, target_model: ObjectTypeModel, object_type_name: str
+    source_types: Dict[str, ObjectTypeModel],
+    target_model: ObjectTypeModel,
+    object_type_name: str,
 ) -> bool:
-    def find_object_type(fields: List[Any]) -> Optional[ObjectTypeModel]:
-        for field in fields:
-            if isinstance(field, ObjectTypeModel) and field.name == object_type_name:
-                return field
-            elif isinstance(field, ObjectFieldModel) and field.related_types:
-                found_type = find_object_type(field.related_types)
-                if found_type:
-                    return found_type
-        return None
-
     logging.debug(f"Searching for object type: {object_type_name}")
-    found_type = find_object_type(source_model.Fields or [])
+    found_type = source_types.get(object_type_name)
     if found_type:
         logging.debug(f"Copying object type: {object_type_name}")
-        copied_object_type = found_type.copy(deep=True)
+        copied_object_type = found_type.model_copy(deep=True)
 
         # Find the fields in the target model that reference the object type
         if target_model.Fields:
@@ -326,9 +330,10 @@ def resolve_invalid_types(
     target_model: ObjectTypeModel,
 ) -> List[str]:
     resolved_types: List[str] = []
+    source_types = index_related_types(source_model)
     for invalid_type in invalid_types:
         logging.warn(f"Resolving invalid type: {invalid_type}")
-        if copy_object_type(source_model, target_model, invalid_type):
+        if copy_object_type(source_types, target_model, invalid_type):
             resolved_types.append(invalid_type)
     return resolved_types
 
@@ -360,14 +365,12 @@ def attach_related_types(
         types = set()
         extract_field_types(field.type, types)
         for type_name in types:
-            if type_name in defined_types:
-                for other_model in defined_types.values():
-                    if other_model.name == type_name:
-                        if not field.related_types:
-                            field.related_types = []
-                        if other_model not in field.related_types:
-                            field.related_types.append(other_model)
-                        break
+            # defined_types is keyed by the type name
+            if other_model := defined_types.get(type_name):
+                if not field.related_types:
+                    field.related_types = []
+                if other_model not in field.related_types:
+                    field.related_types.append(other_model)
     defined_types[model.name] = model
 
 
@@ -385,6 +388,8 @@ def parse_object_model(
     List[str],
     List[str],
 ]:
+    # allowed_types holds every typing name, check membership against a set
+    allowed_type_names = set(allowed_types)
     request_types: Set[str] = set()
     response_types: Set[str] = set()
     request_object_types: List[ObjectTypeModel] = []
@@ -405,20 +410,20 @@ def parse_object_model(
     invalid_request_types = [
         type_name
         for type_name in request_types
-        if not is_valid_type(type_name, request_type_names, allowed_types)
+        if not is_valid_type(type_name, request_type_names, allowed_type_names)
     ]
     invalid_response_types = [
         type_name
         for type_name in response_types
-        if not is_valid_type(type_name, response_type_names, allowed_types)
+        if not is_valid_type(type_name, response_type_names, allowed_type_names)
     ]
 
     while invalid_request_types or invalid_response_types:
-        resolved_request_types = resolve_invalid_types(
-            invalid_request_types, response_model, request_model
+        resolved_request_types = set(
+            resolve_invalid_types(invalid_request_types, response_model, request_model)
         )
-        resolved_response_types = resolve_invalid_types(
-            invalid_response_types, request_model, response_model
+        resolved_response_types = set(
+            resolve_invalid_types(invalid_response_types, request_model, response_model)
         )
 
         if not resolved_request_types and not resolved_response_types:
@@ -456,12 +461,12 @@ def parse_object_model(
     invalid_request_types_post = [
         type_name
         for type_name in request_types_post
-        if not is_valid_type(type_name, request_type_names_post, allowed_types)
+        if not is_valid_type(type_name, request_type_names_post, allowed_type_names)
     ]
     invalid_response_types_post = [
         type_name
         for type_name in response_types_post
-        if not is_valid_type(type_name, response_type_names_post, allowed_types)
+        if not is_valid_type(type_name, response_type_names_post, allowed_type_names)
     ]
 
     return (
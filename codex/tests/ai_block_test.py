@@ -0,0 +1,67 @@
+from typing import Optional
+
+import pytest
+from pydantic import BaseModel
+
+from codex.common.ai_block import get_response_format, to_strict_json_schema
+
+
+class Address(BaseModel):
+    street: str
+    city: str = "London"
+
+
+class Person(BaseModel):
+    name: str
+    nickname: Optional[str] = None
+    address: Address
+
+
+class Directory(BaseModel):
+    people: list[Person]
+    aliases: dict[str, str]
+
+
+def test_strict_schema_nested_model():
+    schema = to_strict_json_schema(Person.model_json_schema())
+
+    assert schema["additionalProperties"] is False
+    assert schema["required"] == ["name", "nickname", "address"]
+    assert schema["properties"]["address"] == {"$ref": "#/$defs/Address"}
+
+    address = schema["$defs"]["Address"]
+    assert address["additionalProperties"] is False
+    assert address["required"] == ["street", "city"]
+    assert "default" not in address["properties"]["city"]
+    assert "title" not in address
+
+
+def test_strict_schema_optional_field():
+    schema = to_strict_json_schema(Person.model_json_schema())
+
+    # Optional fields stay required, but accept null
+    assert "nickname" in schema["required"]
+    assert schema["properties"]["nickname"] == {
+        "anyOf": [{"type": "string"}, {"type": "null"}]
+    }
+
+
+def test_strict_schema_dict_field():
+    with pytest.raises(ValueError):
+        to_strict_json_schema(Directory.model_json_schema())
+
+
+def test_response_format():
+    response_format = get_response_format(Person)
+
+    assert response_format is not None
+    assert response_format["type"] == "json_schema"
+    assert response_format["json_schema"]["name"] == "Person"
+    assert response_format["json_schema"]["strict"] is True
+    assert response_format["json_schema"]["schema"] == to_strict_json_schema(
+        Person.model_json_schema()
+    )
+
+
+def test_response_format_falls_back_for_dict_fields():
+    assert get_response_format(Directory) is None
@@ -0,0 +1,159 @@
+from types import SimpleNamespace
+
+import pytest
+from openai.types.chat import (
+    ChatCompletion,
+    ChatCompletionChunk,
+    ChatCompletionMessage,
+)
+from openai.types.chat.chat_completion import Choice
+from openai.types.chat.chat_completion_chunk import Choice as ChunkChoice
+from openai.types.chat.chat_completion_chunk import ChoiceDelta
+
+from codex.common.ai_model import OpenAIChatClient
+
+
+def make_completion(content: str) -> ChatCompletion:
+    return ChatCompletion(
+        id="chatcmpl-test",
+        created=0,
+        model="gpt-4o",
+        object="chat.completion",
+        choices=[
+            Choice(
+                index=0,
+                finish_reason="stop",
+                message=ChatCompletionMessage(role="assistant", content=content),
+            )
+        ],
+    )
+
+
+def make_request(question: str) -> dict:
+    return {
+        "model": "gpt-4o",
+        "messages": [{"role": "user", "content": question}],
+    }
+
+
+@pytest.fixture
+def cached_client(tmp_path, monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_DIR", str(tmp_path))
+    # The cache is checked before the OpenAI client is ever used
+    monkeypatch.setattr(OpenAIChatClient, "_configured", True)
+    monkeypatch.setattr(OpenAIChatClient, "_instance", object())
+    return tmp_path
+
+
+@pytest.mark.asyncio
+async def test_cache_round_trip(cached_client):
+    request = make_request("What is the capital of France?")
+    cache_path = OpenAIChatClient._cache_path(request)
+    assert cache_path is not None
+    OpenAIChatClient._write_cache(cache_path, make_completion("Paris"))
+
+    response = await OpenAIChatClient.chat(
+        make_request("What is the capital of France?")
+    )
+    assert response.choices[0].message.content == "Paris"
+
+
+def test_cache_is_keyed_on_request_params(cached_client):
+    paris = OpenAIChatClient._cache_path(make_request("Capital of France?"))
+    berlin = OpenAIChatClient._cache_path(make_request("Capital of Germany?"))
+    assert paris and berlin and paris != berlin
+
+    OpenAIChatClient._write_cache(paris, make_completion("Paris"))
+    assert OpenAIChatClient._read_cache(berlin) is None
+    cached = OpenAIChatClient._read_cache(paris)
+    assert cached and cached.choices[0].message.content == "Paris"
+    # Only the entry itself is left behind, no temp files
+    assert list(cached_client.iterdir()) == [paris]
+
+
+def test_undecodable_cache_entry_is_a_miss(cached_client):
+    cache_path = OpenAIChatClient._cache_path(make_request("Capital of Spain?"))
+    assert cache_path is not None
+    cache_path.write_text('{"id": "chatcmpl-test", "choi')
+
+    assert OpenAIChatClient._read_cache(cache_path) is None
+
+
+def test_failed_cache_write_leaves_no_temp_file(cached_client, monkeypatch):
+    cache_path = OpenAIChatClient._cache_path(make_request("Capital of Italy?"))
+    assert cache_path is not None
+
+    def fail_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("codex.common.ai_model.os.replace", fail_replace)
+    with pytest.raises(OSError):
+        OpenAIChatClient._write_cache(cache_path, make_completion("Rome"))
+
+    assert list(cached_client.iterdir()) == []
+
+
+class FakeStream:
+    def __init__(self, deltas: list[str]):
+        self.deltas = deltas
+        self.consumed = 0
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> ChatCompletionChunk:
+        if self.consumed == len(self.deltas):
+            raise StopAsyncIteration
+        delta = self.deltas[self.consumed]
+        self.consumed += 1
+        return ChatCompletionChunk(
+            id="chatcmpl-test",
+            created=0,
+            model="gpt-4o",
+            object="chat.completion.chunk",
+            choices=[ChunkChoice(index=0, delta=ChoiceDelta(content=delta))],
+        )
+
+    async def close(self):
+        self.closed = True
+
+
+def make_streaming_client(stream: FakeStream):
+    async def create(**kwargs):
+        return stream
+
+    return SimpleNamespace(
+        openai=SimpleNamespace(
+            chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+        )
+    )
+
+
+class WhitespaceEncoding:
+    def encode(self, text: str) -> list[str]:
+        return text.split()
+
+
+@pytest.mark.asyncio
+async def test_stream_until_stops_early(monkeypatch):
+    # The real tokenizer is downloaded on first use, keep the test offline
+    monkeypatch.setattr(
+        "codex.common.ai_model.get_token_encoding", lambda: WhitespaceEncoding()
+    )
+    stream = FakeStream(["```python\n", "x = 1\n", "```", "\nUnused explanation"])
+    checked = []
+
+    def stop_when(text: str) -> bool:
+        checked.append(text)
+        return text.count("```") == 2
+
+    response = await OpenAIChatClient._stream_until(
+        make_streaming_client(stream), make_request("Write x"), stop_when
+    )
+
+    assert response.choices[0].message.content == "```python\nx = 1\n```"
+    assert stream.consumed == 3 and stream.closed
+    # Only chunks containing a backtick are checked
+    assert checked == ["```python\n", "```python\nx = 1\n```"]
+    assert response.usage and response.usage.completion_tokens == 5
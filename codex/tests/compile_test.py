@@ -1,9 +1,18 @@
+import ast
 from datetime import datetime
 
-from prisma.models import ObjectField, ObjectType
+from prisma.enums import FunctionState, HTTPVerb
+from prisma.models import (
+    APIRouteSpec,
+    CompiledRoute,
+    Function,
+    ObjectField,
+    ObjectType,
+)
 
 from codex.develop.compile import (
     add_full_import_parth_to_custom_types,
+    create_server_routes_code,
     extract_path_params,
 )
 from codex.develop.function import generate_object_template
@@ -206,3 +215,62 @@ def test_multiple_related_types_with_similiar_name():
 
     # Assert
     assert result == "Tuple[project.User, project.UserProfile]"
+
+
+def make_get_user_route(route_id: str, file_name: str, path: str) -> CompiledRoute:
+    return CompiledRoute(
+        id=route_id,
+        createdAt=datetime.now(),
+        description="Gets a user",
+        fileName=file_name,
+        mainFunctionName="get_user",
+        compiledCode="",
+        completedAppId="app",
+        rootFunctionId=f"{route_id}-func",
+        RootFunction=Function(
+            id=f"{route_id}-func",
+            createdAt=datetime.now(),
+            updatedAt=datetime.now(),
+            functionName="get_user",
+            template="async def get_user(user_id: str) -> str:",
+            state=FunctionState.WRITTEN,
+            importStatements=[],
+            FunctionArgs=[
+                ObjectField(
+                    id=f"{route_id}-arg",
+                    createdAt=datetime.now(),
+                    name="user_id",
+                    typeName="str",
+                )
+            ],
+        ),
+        ApiRouteSpec=APIRouteSpec(
+            id=f"{route_id}-spec",
+            createdAt=datetime.now(),
+            functionName="get_user",
+            method=HTTPVerb.GET,
+            path=path,
+            description="Gets a user",
+            AllowedAccessRoles=[],
+        ),
+    )
+
+
+def test_server_routes_have_unique_handler_names():
+    routes_code = create_server_routes_code(
+        [
+            make_get_user_route("a", "get_user_service.py", "/users/{user_id}"),
+            make_get_user_route("b", "get_admin_service.py", "/admins/{user_id}"),
+            make_get_user_route("c", "get_guest_service.py", "/guests/{user_id}"),
+        ]
+    )
+
+    server_code = ast.parse("\n\n".join(routes_code))
+    handler_names = [
+        node.name for node in server_code.body if isinstance(node, ast.AsyncFunctionDef)
+    ]
+    assert handler_names == [
+        "api_get_get_user",
+        "api_get_get_user_1",
+        "api_get_get_user_2",
+    ]
@@ -0,0 +1,82 @@
+from codex.develop.develop import (
+    PYTHON_BLOCK_PATTERN,
+    REQUIREMENTS_BLOCK_PATTERN,
+    DevelopAIBlock,
+    NiceGUIDevelopAIBlock,
+)
+
+COMPLETE_RESPONSE = """Here is the function:
+```requirements
+requests==2.31.0
+```
+```python
+def add(a: int, b: int) -> int:
+    return a + b
+```
+"""
+
+
+def test_generation_complete():
+    assert DevelopAIBlock().is_generation_complete(COMPLETE_RESPONSE)
+
+
+def test_generation_complete_py_fence():
+    response = COMPLETE_RESPONSE.replace("```python", "```py")
+    assert DevelopAIBlock().is_generation_complete(response)
+
+
+def test_generation_not_complete_without_requirements():
+    response = """```python
+def add(a: int, b: int) -> int:
+    return a + b
+```
+"""
+    assert not DevelopAIBlock().is_generation_complete(response)
+
+
+def test_generation_not_complete_unterminated_fence():
+    response = COMPLETE_RESPONSE.rstrip().removesuffix("```")
+    assert not DevelopAIBlock().is_generation_complete(response)
+
+
+def test_nicegui_generation_never_complete():
+    assert not NiceGUIDevelopAIBlock().is_generation_complete(COMPLETE_RESPONSE)
+
+
+def test_extract_blocks():
+    assert REQUIREMENTS_BLOCK_PATTERN.findall(COMPLETE_RESPONSE) == [
+        "\nrequests==2.31.0\n"
+    ]
+    assert PYTHON_BLOCK_PATTERN.findall(COMPLETE_RESPONSE) == [
+        "def add(a: int, b: int) -> int:\n    return a + b\n"
+    ]
+
+
+def test_extract_python_block_py_alias():
+    response = "```py\nx = 1\n```"
+    assert PYTHON_BLOCK_PATTERN.findall(response) == ["x = 1\n"]
+
+
+def test_extract_python_block_version_suffix():
+    for fence in ("```python3", "```py3"):
+        response = f"{fence}\nx = 1\n```"
+        assert PYTHON_BLOCK_PATTERN.findall(response) == ["x = 1\n"]
+
+
+def test_extract_python_block_fence_line_text():
+    response = "```python title=service.py\nx = 1\n```"
+    assert PYTHON_BLOCK_PATTERN.findall(response) == ["x = 1\n"]
+
+
+def test_extract_python_block_ignores_other_languages():
+    response = "```pyproject\n[tool.poetry]\n```\n```pythonic\nx = 1\n```"
+    assert PYTHON_BLOCK_PATTERN.findall(response) == []
+
+
+def test_extract_unterminated_final_block():
+    response = "```requirements\nrequests\n```\n```python\nx = 1\ny = 2\n"
+    assert REQUIREMENTS_BLOCK_PATTERN.findall(response) == ["\nrequests\n"]
+    assert PYTHON_BLOCK_PATTERN.findall(response) == ["x = 1\ny = 2\n"]
+
+    response = "```requirements\nrequests\n"
+    assert REQUIREMENTS_BLOCK_PATTERN.findall(response) == ["\nrequests\n"]